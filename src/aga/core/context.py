@@ -7,6 +7,10 @@ from typing import Iterable, Any
 class SubmissionContext(dict[str, Any]):
     """Environment value wrapper."""
 
+    # values live in the dict itself, so instances don't need an attribute dict too;
+    # attribute writes go into the dict as well
+    __slots__ = ()
+
     def __init__(self, env_targets: Iterable[str]) -> None:
         super().__init__()
         for target in env_targets:
@@ -14,12 +18,15 @@ class SubmissionContext(dict[str, Any]):
 
     def update_from_path(self, path: str) -> None:
         """Update environment values from a given module."""
+        if not self:
+            return
+
         # pylint: disable=import-outside-toplevel, cyclic-import
         # to avoid circular imports, I place the import here
-        from ..loader import load_symbol_from_path
+        from ..loader import load_symbols_from_path
 
-        for symbol in self.keys():
-            self[symbol] = load_symbol_from_path(path, symbol)
+        # load every symbol in one pass, rather than loading the submission once each
+        self.update(load_symbols_from_path(path, self.keys()))
 
     def __getattr__(self, item: str) -> Any:
         """Get the value of an environment variable."""
@@ -27,3 +34,14 @@ class SubmissionContext(dict[str, Any]):
             return self[item]
         except KeyError as e:
             raise AttributeError(e) from e
+
+    def __setattr__(self, item: str, value: Any) -> None:
+        """Set the value of an environment variable."""
+        self[item] = value
+
+    def __delattr__(self, item: str) -> None:
+        """Delete an environment variable."""
+        try:
+            del self[item]
+        except KeyError as e:
+            raise AttributeError(e) from e
@@ -1,10 +1,12 @@
 """Parameter wrappers."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import random
+from collections.abc import Iterable, Iterator
 from enum import Enum
 from functools import partial
 from itertools import product
+from math import prod
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -38,6 +40,7 @@ class AgaReservedKeywords(Enum):
     aga_override_test = "aga_override_test"
     aga_description = "aga_description"
     aga_is_pipeline = "aga_is_pipeline"
+    aga_pure = "aga_pure"
 
 
 DEFAULT_AGA_RESERVED_VALUES = {
@@ -52,8 +55,12 @@ DEFAULT_AGA_RESERVED_VALUES = {
     "aga_override_test": None,
     "aga_description": None,
     "aga_is_pipeline": False,
+    "aga_pure": True,
 }
 
+# the values of `AgaReservedKeywords`, for fast membership tests
+_AGA_RESERVED_KEYWORDS = frozenset(kwd.value for kwd in AgaReservedKeywords)
+
 
 class AgaKeywordDictType(TypedDict):
     """Aga keyword arguments type."""
@@ -69,6 +76,7 @@ class AgaKeywordDictType(TypedDict):
     aga_override_test: None | Callable[..., Any]
     aga_description: None | str
     aga_is_pipeline: bool
+    aga_pure: bool
 
 
 __all__ = [
@@ -94,9 +102,46 @@ def _check_default_values() -> None:
 _check_default_values()
 
 
+def _sample_product(
+    k: int, *iterables: Iterable[Any], seed: int | None = None
+) -> Iterator[Tuple[Any, ...]]:
+    """Draw `k` distinct elements of the cartesian product of `iterables`, in order.
+
+    Only the drawn elements are built, by decoding their indices into the product,
+    rather than building the whole product and sampling from it. The draw uses its own
+    generator, seeded with `seed`, so it neither depends on nor disturbs the global
+    `random` state.
+    """
+    pools = [tuple(it) for it in iterables]
+    size = prod(map(len, pools))
+    if isinstance(k, bool) or not isinstance(k, int) or not 0 <= k <= size:
+        raise ValueError(
+            "aga_sample must be an integer between 0 and the size of the product, "
+            f"which is {size}"
+        )
+
+    for index in sorted(random.Random(seed).sample(range(size), k)):
+        values = []
+        for pool in reversed(pools):
+            index, offset = divmod(index, len(pool))
+            values.append(pool[offset])
+        yield tuple(reversed(values))
+
+
+def _ensure_no_aga_kwargs(kwargs: Iterable[str]) -> None:
+    """Raise an error if any of the keywords in `kwargs` is an aga_* keyword."""
+    for k in kwargs:
+        if k.startswith("aga_"):
+            raise ValueError(
+                f'aga keyword "{k}" should not be in kwargs of a test param'
+            )
+
+
 class AgaKeywordContainer:
     """A container for aga_* keyword arguments."""
 
+    __slots__ = ["_aga_kwargs"]
+
     def __init__(self, **kwargs: Any):
         self.aga_kwargs: AgaKeywordDictType = cast(AgaKeywordDictType, kwargs)
 
@@ -114,10 +159,8 @@ class AgaKeywordContainer:
     def ensure_aga_kwargs(self) -> AgaKeywordContainer:
         """Ensure that the aga_* keywords are handled correct."""
         for k in self.aga_kwargs:
-            try:
-                AgaReservedKeywords(k)
-            except ValueError as e:
-                raise ValueError(f'invalid kwargs "{k}" in a test param') from e
+            if k not in _AGA_RESERVED_KEYWORDS:
+                raise ValueError(f'invalid kwargs "{k}" in a test param')
         return self
 
     def update_aga_kwargs(self, **kwargs: Any) -> AgaKeywordContainer:
@@ -128,75 +171,82 @@ class AgaKeywordContainer:
 
     def ensure_default_aga_values(self) -> AgaKeywordContainer:
         """Ensure that the aga_* keywords all have default."""
-        self.aga_kwargs = cast(
-            AgaKeywordDictType, {**DEFAULT_AGA_RESERVED_VALUES, **self.aga_kwargs}
-        )
+        # the defaults are all reserved keywords and ours were checked when they were
+        # set, so we skip the setter's validation
+        aga_kwargs: Dict[str, Any] = DEFAULT_AGA_RESERVED_VALUES.copy()
+        aga_kwargs.update(self._aga_kwargs)
+        self._aga_kwargs = cast(AgaKeywordDictType, aga_kwargs)
         return self
 
     @property
     def description(self) -> str | None:
         """Get the description of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_description.value]
+        return self._aga_kwargs["aga_description"]
 
     @description.setter
     def description(self, desc: str | None) -> None:
         """Set the description of the test case."""
-        self.aga_kwargs[AgaReservedKeywords.aga_description.value] = desc
+        self._aga_kwargs["aga_description"] = desc
 
     @property
     def name(self) -> str | None:
         """Get the name of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_name.value]
+        return self._aga_kwargs["aga_name"]
 
     @name.setter
     def name(self, name: str | None) -> None:
         """Set the name of the test case."""
-        self.aga_kwargs[AgaReservedKeywords.aga_name.value] = name
+        self._aga_kwargs["aga_name"] = name
 
     @property
     def override_test(self) -> Callable[..., Any] | None:
         """Get the override_test aga_override_test of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_override_test.value]
+        return self._aga_kwargs["aga_override_test"]
 
     @property
     def override_check(self) -> Callable[..., Any] | None:
         """Get the override_check aga_override_check of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_override_check.value]
+        return self._aga_kwargs["aga_override_check"]
 
     @property
     def is_pipeline(self) -> bool:
         """Get the is_pipeline aga_is_pipeline of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_is_pipeline.value]
+        return self._aga_kwargs["aga_is_pipeline"]
+
+    @property
+    def pure(self) -> bool:
+        """Get the pure aga_pure of the test case."""
+        return self._aga_kwargs["aga_pure"]
 
     @property
     def weight(self) -> int:
         """Get the weight aga_weight of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_weight.value]
+        return self._aga_kwargs["aga_weight"]
 
     @property
     def value(self) -> float:
         """Get the value aga_value of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_value.value]
+        return self._aga_kwargs["aga_value"]
 
     @property
     def extra_credit(self) -> float:
         """Get the extra credit aga_extra_credit of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_extra_credit.value]
+        return self._aga_kwargs["aga_extra_credit"]
 
     @property
     def hidden(self) -> bool:
         """Get the hidden aga_hidden of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_hidden.value]
+        return self._aga_kwargs["aga_hidden"]
 
     @property
     def expect(self) -> Any:
         """Get the expected aga_expect of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_expect.value]
+        return self._aga_kwargs["aga_expect"]
 
     @property
     def expect_stdout(self) -> str | None:
         """Get the expected aga_expect_stdout of the test case."""
-        return self.aga_kwargs[AgaReservedKeywords.aga_expect_stdout.value]
+        return self._aga_kwargs["aga_expect_stdout"]
 
     def aga_kwargs_repr(self, sep: str = ",") -> str:
         """Return a string representation of the test's aga_* keyword arguments."""
@@ -204,11 +254,11 @@ class AgaKeywordContainer:
 
 
 class _TestParam(AgaKeywordContainer):
-    __slots__ = ["_args", "_kwargs", "_aga_kwargs"]
+    __slots__ = ["_args", "_kwargs"]
 
     pipeline: ClassVar[partial[_TestParam]]
 
-    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-arguments, super-init-not-called
     @overload
     def __init__(
         self,
@@ -224,6 +274,7 @@ class _TestParam(AgaKeywordContainer):
         aga_override_check: Callable[..., Any] | None = None,
         aga_override_test: Callable[..., Any] | None = None,
         aga_is_pipeline: bool = False,
+        aga_pure: bool = True,
         **kwargs: Any,
     ) -> None:
         ...
@@ -277,6 +328,11 @@ class _TestParam(AgaKeywordContainer):
             :ref:`Overriding the Entire Test` for more.
         aga_is_pipeline: bool
             If True, the test case will be run through as a pipeline.
+        aga_pure : bool
+            Whether the golden solution is deterministic and side-effect free on this
+            input. If True (the default), the golden solution's output is computed
+            once and reused, including between `check` and grading; set this to False
+            if the golden solution must be re-run for every test.
         kwargs :
             Keyword arguments to be passed to the functions under test. Any keyword
             starting with aga\_ is reserved.
@@ -286,12 +342,14 @@ class _TestParam(AgaKeywordContainer):
         Callable[[Problem[T]], Problem[T]]
             A decorator which adds the test case to a problem.
         """
-        super().__init__(
-            **{
-                k.value: kwargs.pop(k.value)
-                for k in AgaReservedKeywords
-                if k.value in kwargs
-            }
+        # pop aga keywords out; there are usually fewer kwargs than reserved keywords.
+        # they're all reserved, so we skip `AgaKeywordContainer`'s validation
+        self._aga_kwargs = cast(
+            AgaKeywordDictType,
+            {
+                k: kwargs.pop(k)
+                for k in [k for k in kwargs if k in _AGA_RESERVED_KEYWORDS]
+            },
         )
         self.kwargs = kwargs
         self.args = args
@@ -317,39 +375,53 @@ class _TestParam(AgaKeywordContainer):
         self._kwargs = kwargs
         self.ensure_valid_kwargs()
 
+    @classmethod
+    def _unchecked(
+        cls, args: Tuple[Any, ...], kwargs: Dict[str, Any] | None = None
+    ) -> _TestParam:
+        """Build a param without aga_* keywords, skipping `__init__`'s validation.
+
+        `test_cases` builds one param per test from inputs it has already checked, and
+        `finalize` validates every param again before it's added to a problem.
+        """
+        new = cls.__new__(cls)
+        new._args = args
+        new._kwargs = {} if kwargs is None else kwargs
+        new._aga_kwargs = cast(AgaKeywordDictType, {})
+        return new
+
     def ensure_valid_kwargs(self) -> _TestParam:
         """Ensure that the aga_* keywords are handled correct."""
-        for k in self.kwargs:
-            if k.startswith("aga_"):
-                raise ValueError(
-                    f'aga keyword "{k}" should not be in kwargs of a test param'
-                )
+        _ensure_no_aga_kwargs(self.kwargs)
         return self
 
     def args_repr(self, sep: str = ",") -> str:
         """Return a string representation of the test's arguments."""
-        return sep.join(repr(x) for x in self.args)
+        return sep.join(repr(x) for x in self._args)
 
     def kwargs_repr(self, sep: str = ",") -> str:
         """Return appropriate string representation of the test's keyword arguments."""
         # we use k instead of repr(k) so we don't get quotes around it
-        return sep.join(k + "=" + repr(v) for k, v in self.kwargs.items())
+        return sep.join(k + "=" + repr(v) for k, v in self._kwargs.items())
 
     def sep_repr(self, sep: str = ",") -> str:
         """Return sep if both exist, "" otherwise."""
-        return self.args and self.kwargs and sep or ""
+        return sep if self._args and self._kwargs else ""
 
     def generate_test_case(
         self, prob: Problem[ProblemParamSpec, ProblemOutputType]
     ) -> Problem[ProblemParamSpec, ProblemOutputType]:
         """Generate a test case for the given problem."""
-        self.ensure_default_aga_values()
-        self.ensure_valid_kwargs().ensure_aga_kwargs()  # type: ignore
-
-        prob.add_test_case(param=self)
+        prob.add_test_case(param=self.finalize())
 
         return prob
 
+    def finalize(self) -> _TestParam:
+        """Fill in default aga_* values and validate the param before it is added."""
+        self.ensure_default_aga_values()
+        self.ensure_valid_kwargs().ensure_aga_kwargs()
+        return self
+
     def __call__(
         self, prob: Problem[ProblemParamSpec, ProblemOutputType]
     ) -> Problem[ProblemParamSpec, ProblemOutputType]:
@@ -377,6 +449,9 @@ test_case = _TestParam  # pylint: disable=invalid-name
 class _TestParams:
     """A class to store the parameters for a test."""
 
+    # pylint: disable=protected-access
+    # the parsers build their params with `_TestParam._unchecked`
+
     __slots__ = ["final_params"]
 
     params: ClassVar[partial[_TestParams]]
@@ -400,10 +475,13 @@ class _TestParams:
         aga_override_check: Callable[..., Any] | None = None,
         aga_override_test: Callable[..., Any] | None = None,
         aga_is_pipeline: bool = False,
+        aga_pure: bool = True,
         aga_product: bool = False,
         aga_zip: bool = False,
         aga_params: bool = False,
         aga_singular_params: bool = False,
+        aga_sample: int | None = None,
+        aga_sample_seed: int | None = None,
         **kwargs: Any,
     ):
         ...
@@ -419,6 +497,8 @@ class _TestParams:
         aga_zip: bool = False,
         aga_params: bool = False,
         aga_singular_params: bool = False,
+        aga_sample: int | None = None,
+        aga_sample_seed: int | None = None,
         **kwargs: Any,
     ) -> None:
         r"""Generate many test cases programmatically, from generators of inputs.
@@ -439,6 +519,14 @@ class _TestParams:
         aga_singular_params : bool
             Whether to treat the input generators as a single iterable of single params.
             Default `False`.
+        aga_sample : int | None
+            If given with `aga_product`, only this many test cases are drawn at random,
+            without replacement, from the cartesian product, rather than creating all of
+            them. The drawn cases keep their order in the product. Default `None`.
+        aga_sample_seed : int | None
+            The seed for `aga_sample`'s draw. Passing the same seed draws the same
+            test cases every time; if `None`, a different sample is drawn each time the
+            problem is loaded. Default `None`.
         kwargs :
             `aga_` keywords have their meaning inherited from `test_case`, and are
             applied to each test case generated by this function. Singleton value and
@@ -461,11 +549,15 @@ class _TestParams:
                 f"aga_product={aga_product}, aga_zip={aga_zip}, aga_params={aga_params}"
             )
 
-        # pop aga keywords out
+        if aga_sample is not None and not aga_product:
+            raise ValueError("aga_sample requires aga_product=True")
+
+        if aga_sample_seed is not None and aga_sample is None:
+            raise ValueError("aga_sample_seed requires aga_sample")
+
+        # pop aga keywords out; there are usually fewer kwargs than reserved keywords
         aga_kwargs_dict = {
-            kwd.value: kwargs.pop(kwd.value)
-            for kwd in AgaReservedKeywords
-            if kwd.value in kwargs
+            k: kwargs.pop(k) for k in [k for k in kwargs if k in _AGA_RESERVED_KEYWORDS]
         }
 
         if aga_params:
@@ -478,7 +570,12 @@ class _TestParams:
             self.final_params = type(self).parse_singular_params(*args, **kwargs)
         elif aga_zip or aga_product:
             self.final_params = type(self).parse_zip_or_product(
-                *args, aga_zip=aga_zip, aga_product=aga_product, **kwargs
+                *args,
+                aga_zip=aga_zip,
+                aga_product=aga_product,
+                aga_sample=aga_sample,
+                aga_sample_seed=aga_sample_seed,
+                **kwargs,
             )
         else:
             self.final_params = type(self).parse_no_flag(*args, **kwargs)
@@ -497,7 +594,8 @@ class _TestParams:
             )
 
         return list(
-            arg if isinstance(arg, _TestParam) else param(*arg) for arg in args[0]
+            arg if isinstance(arg, _TestParam) else _TestParam._unchecked(tuple(arg))
+            for arg in args[0]
         )
 
     @staticmethod
@@ -513,7 +611,8 @@ class _TestParams:
             )
 
         return list(
-            arg if isinstance(arg, _TestParam) else param(arg) for arg in args[0]
+            arg if isinstance(arg, _TestParam) else _TestParam._unchecked((arg,))
+            for arg in args[0]
         )
 
     @staticmethod
@@ -521,38 +620,68 @@ class _TestParams:
         *args: Iterable[Any],
         aga_product: bool = False,
         aga_zip: bool = False,
+        aga_sample: int | None = None,
+        aga_sample_seed: int | None = None,
         **kwargs: Any,
     ) -> List[_TestParam]:
         """Parse parameters for zip or product."""
         if not aga_zip ^ aga_product:
             raise ValueError("exactly one of aga_zip or aga_product must be True")
-        combinator = product if aga_product else zip
 
-        # ok so if the combinator is product
-        # we are taking the cartesian product for all args and kwargs
-        # and if the combinator is zip,
-        # we are zipping all the args and kwargs, if there are any
-        combined_args = list(combinator(*args))
-        combined_kwargs = list(combinator(*kwargs.values()))
+        # every param gets the same keywords, so we check them once here
+        _ensure_no_aga_kwargs(kwargs)
+
+        if aga_product:
+            # the cartesian product of the args followed by the kwargs is in the same
+            # order as the product of the args' product with the kwargs' product, so we
+            # take a single flat product and split each tuple, rather than building
+            # both intermediate products
+            num_args = len(args)
+            keys = kwargs.keys()
+            combos: Iterable[Tuple[Any, ...]] = (
+                product(*args, *kwargs.values())
+                if aga_sample is None
+                else _sample_product(
+                    aga_sample, *args, *kwargs.values(), seed=aga_sample_seed
+                )
+            )
+            return [
+                _TestParam._unchecked(
+                    values[:num_args], dict(zip(keys, values[num_args:]))
+                )
+                for values in combos
+            ]
+
+        # with only args or only kwargs, there's nothing to pair up, so we build the
+        # params straight from the zip
+        keys = kwargs.keys()
+        if not kwargs:
+            return [_TestParam._unchecked(curr_args) for curr_args in zip(*args)]
+        if not args:
+            return [
+                _TestParam._unchecked((), dict(zip(keys, curr_kwargs)))
+                for curr_kwargs in zip(*kwargs.values())
+            ]
+
+        # we are zipping all the args and kwargs
+        combined_args = list(zip(*args))
+        combined_kwargs = list(zip(*kwargs.values()))
 
         # ======= validation checks =======
-        if combinator is zip:
-            # create empty args for zip if there are no args
-            if combined_args and combined_kwargs:
-                if len(combined_args) != len(combined_kwargs):
-                    raise ValueError(
-                        'length of "args" and "kwargs" must match in zip mode'
-                    )
-            elif combined_args:
-                combined_kwargs = [()] * len(combined_args)
-            elif combined_kwargs:
-                combined_args = [()] * len(combined_kwargs)
-
-        all_args_and_kwargs = list(combinator(combined_args, combined_kwargs))
+        # create empty args for zip if there are no args
+        if combined_args and combined_kwargs:
+            if len(combined_args) != len(combined_kwargs):
+                raise ValueError('length of "args" and "kwargs" must match in zip mode')
+        elif combined_args:
+            combined_kwargs = [()] * len(combined_args)
+        elif combined_kwargs:
+            combined_args = [()] * len(combined_kwargs)
+
+        all_args_and_kwargs = zip(combined_args, combined_kwargs)
 
         # ======= zipping all the args together =======
         return list(
-            param(*curr_args, **dict(zip(kwargs.keys(), curr_kwargs)))
+            _TestParam._unchecked(curr_args, dict(zip(keys, curr_kwargs)))
             for (curr_args, curr_kwargs) in all_args_and_kwargs
         )
 
@@ -562,13 +691,17 @@ class _TestParams:
         if kwargs:
             raise ValueError("`test_cases` with no flags ignores non-aga kwargs")
 
-        return [param(arg) for arg in args]
+        return [_TestParam._unchecked((arg,)) for arg in args]
 
     @staticmethod
     def add_aga_kwargs(
         aga_kwargs: Dict[str, Any], final_params: List[_TestParam]
     ) -> None:
         """Add aga_kwargs to the finalized parameters."""
+        if not aga_kwargs:
+            # the params' own aga kwargs were already validated when they were built
+            return
+
         # process aga input type
         for aga_kwarg_key, aga_kwarg_value in aga_kwargs.items():
             if isinstance(aga_kwarg_value, Iterable) and not isinstance(
@@ -579,10 +712,7 @@ class _TestParams:
                 aga_kwargs[aga_kwarg_key] = [aga_kwarg_value] * len(final_params)
 
         # validate aga input type
-        if not all(
-            len(aga_kwarg_value) == len(final_params)
-            for aga_kwarg_value in aga_kwargs.values()
-        ):
+        if set(map(len, aga_kwargs.values())) != {len(final_params)}:
             # the length of the kwargs should be equal to the number of test cases
             # i.e. the length of the combined args
             raise ValueError(
@@ -590,25 +720,19 @@ class _TestParams:
                 f"which is {len(final_params)}"
             )
 
-        # the aga kwargs list we want
-        aga_kwargs_list: List[Dict[str, Any]] = [
-            dict(zip(aga_kwargs.keys(), aga_kwarg_value))
-            for aga_kwarg_value in zip(*aga_kwargs.values())
-        ]
-
-        if not aga_kwargs_list:
-            # generate default aga kwargs dict if there are no aga kwargs
-            aga_kwargs_list = [{} for _ in final_params]
-
-        for final_param, kwargs in zip(final_params, aga_kwargs_list):
-            final_param.update_aga_kwargs(**kwargs)
+        # the keys were popped out of kwargs because they're reserved keywords, so we
+        # update the params' dicts in place instead of re-validating every one
+        keys = tuple(aga_kwargs)
+        for final_param, aga_kwarg_values in zip(
+            final_params, zip(*aga_kwargs.values())
+        ):
+            final_param._aga_kwargs.update(zip(keys, aga_kwarg_values))  # type: ignore
 
     def __call__(
         self, prob: Problem[ProblemParamSpec, ProblemOutputType]
     ) -> Problem[ProblemParamSpec, ProblemOutputType]:
         """Generate the test cases as a decorator."""
-        for final_param in self.final_params:
-            prob = final_param.generate_test_case(prob)
+        prob.add_test_cases(final_param.finalize() for final_param in self.final_params)
 
         return prob
 
@@ -46,6 +46,9 @@ class Problem(Generic[ProblemParamSpec, ProblemOutputType]):
         self._ungrouped_prizes: list[Prize] = []
         self._ungrouped_tests: list[_TestInputs[ProblemOutputType]] = []
         self._groups: list[_TestInputGroup[ProblemOutputType]] = []
+        self._virtual_groups_cache: Optional[
+            list[_TestInputGroup[ProblemOutputType]]
+        ] = None
         self._submission_context: SubmissionContext = SubmissionContext(ctx_targets)
         self.is_script = is_script
 
@@ -61,22 +64,35 @@ class Problem(Generic[ProblemParamSpec, ProblemOutputType]):
             ctx=self.submission_context,
         )
         self._ungrouped_tests.append(case)
+        self._virtual_groups_cache = None
+
+    def add_test_cases(self, params: Iterable[_TestParam]) -> None:
+        """Add many test cases to the current group at once.
+
+        This is equivalent to calling `add_test_case` on each param in order, but builds
+        all the test inputs in a single pass.
+        """
+        mock_input = self._config.problem.mock_input
+        ctx = self.submission_context
+        self._ungrouped_tests.extend(
+            _TestInputs(param, mock_input=mock_input, ctx=ctx) for param in params
+        )
+        self._virtual_groups_cache = None
 
     def add_prize(self, prize: Prize) -> None:
         """Add a prize to the current group."""
         self._ungrouped_prizes.append(prize)
+        self._virtual_groups_cache = None
 
     def add_group(self, grp: _TestInputGroup[ProblemOutputType]) -> None:
         """Add a group to the problem."""
-        for case in self._ungrouped_tests:
-            grp.add_test_case(case)
-
-        for prize in self._ungrouped_prizes:
-            grp.add_prize(prize)
+        grp.add_test_cases(self._ungrouped_tests)
+        grp.add_prizes(self._ungrouped_prizes)
 
         self._groups.append(grp)
-        self._ungrouped_tests = []
-        self._ungrouped_prizes = []
+        self._ungrouped_tests.clear()
+        self._ungrouped_prizes.clear()
+        self._virtual_groups_cache = None
 
     def config(self) -> AgaConfig:
         """Get access to the problem's config."""
@@ -129,7 +145,9 @@ class Problem(Generic[ProblemParamSpec, ProblemOutputType]):
             suite, prizes = grp.generate_test_suite(
                 self._golden, under_test, score, self._config
             )
-            ret_suite.addTest(suite)
+            # add the group's tests directly, rather than nesting its suite, so that
+            # unittest doesn't recurse through an extra level of suites to run them
+            ret_suite.addTests(suite)
             ret_prizes += prizes
 
         return ret_suite, ret_prizes
@@ -161,20 +179,25 @@ class Problem(Generic[ProblemParamSpec, ProblemOutputType]):
 
         We need to do it this way because while the problem is being read we don't know
         the configuration of the last test group yet.
+
+        The result is cached until the next test case, prize, or group is added. The
+        virtual group shares the ungrouped lists rather than copying them.
         """
+        if self._virtual_groups_cache is not None:
+            return self._virtual_groups_cache
+
         if self._ungrouped_tests or self._ungrouped_prizes:
             virtual_group: _TestInputGroup[ProblemOutputType] = _TestInputGroup()
+            # pylint: disable=protected-access
+            virtual_group._test_cases = self._ungrouped_tests
+            virtual_group._prizes = self._ungrouped_prizes
 
-            for case in self._ungrouped_tests:
-                virtual_group.add_test_case(case)
-
-            for prize in self._ungrouped_prizes:
-                virtual_group.add_prize(prize)
-
-            return self._groups + [virtual_group]
+            self._virtual_groups_cache = self._groups + [virtual_group]
 
         else:
-            return self._groups
+            self._virtual_groups_cache = self._groups
+
+        return self._virtual_groups_cache
 
     def __call__(
         self, *args: ProblemParamSpec.args, **kwargs: ProblemParamSpec.kwargs
@@ -1,18 +1,34 @@
 """Test Suite for the aga.core module."""
 from __future__ import annotations
 
+import pickle
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import timedelta
 from types import FunctionType
-from typing import Any, Callable, Dict, Generic, Iterable, Sequence, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from unittest import TestCase, TestSuite
-from unittest.mock import patch
 
 from aga.core.context import SubmissionContext
 
 from ..config import AgaConfig, AgaTestConfig
-from ..score import Prize, ScoredPrize, ScoreInfo, compute_scores
+from ..score import (
+    Prize,
+    ScoredPrize,
+    ScoreInfo,
+    compute_scores,
+    shared_score_info,
+)
 from ..util import text_diff
 from .parameter import AgaKeywordContainer, _TestParam
 from .utils import CaptureOut, Initializer, initializer
@@ -23,10 +39,111 @@ Output = TypeVar("Output")
 
 _NEW_LINE = "\n"
 
+_IMMUTABLE_TYPES = frozenset({int, float, complex, bool, str, bytes, type(None)})
 
-@dataclass(frozen=True)
-class TestMetadata:
-    """Stores metadata about a specific test case."""
+
+def _is_deeply_immutable(obj: Any) -> bool:
+    """Whether `obj` is built only from immutable builtins.
+
+    Such arguments can be passed to the functions under test directly, since nothing the
+    functions do can change them.
+    """
+    if type(obj) in _IMMUTABLE_TYPES:
+        return True
+    if type(obj) in (tuple, frozenset):
+        return all(_is_deeply_immutable(item) for item in obj)
+    return False
+
+
+_FLAT_CONTAINER_TYPES = frozenset({list, dict, set, bytearray})
+
+
+def _is_shallow_copyable(obj: Any) -> bool:
+    """Whether a shallow copy of `obj` is as good as a deep copy.
+
+    This holds for immutable objects, which need no copy at all, and for builtin
+    containers whose items are all immutable.
+    """
+    if type(obj) is dict:
+        return all(map(_is_deeply_immutable, obj.keys())) and all(
+            map(_is_deeply_immutable, obj.values())
+        )
+    if type(obj) in _FLAT_CONTAINER_TYPES:
+        return all(map(_is_deeply_immutable, obj))
+    return _is_deeply_immutable(obj)
+
+
+def _shallow_copy(obj: Any) -> Any:
+    """Copy a flat builtin container, passing anything else through."""
+    if type(obj) in _FLAT_CONTAINER_TYPES:
+        return obj.copy()
+    return obj
+
+
+_UNPICKLABLE = b""
+
+
+def _try_pickle(obj: Any) -> bytes:
+    """Pickle `obj`, or return `_UNPICKLABLE` if it doesn't round-trip."""
+    try:
+        pickled = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(pickled)
+    # pickling can fail with almost any exception, depending on the object
+    except Exception:  # pylint: disable=broad-except
+        return _UNPICKLABLE
+    return pickled
+
+
+class _Snapshot:
+    """A private copy of a value, which hands out a fresh copy of it on every `get`.
+
+    The copy is made the same way as for test arguments: immutable values are shared,
+    anything else is unpickled from bytes taken up front, or deep-copied if it doesn't
+    pickle.
+    """
+
+    __slots__ = ("_value", "_pickled", "_deep")
+
+    def __init__(self, value: Any) -> None:
+        """Take the snapshot; raises if `value` can't be copied at all."""
+        self._value: Any = None
+        self._pickled: bytes | None = None
+        self._deep = False
+        if _is_deeply_immutable(value):
+            self._value = value
+            return
+
+        pickled = _try_pickle(value)
+        if pickled is not _UNPICKLABLE:
+            self._pickled = pickled
+        else:
+            self._value = deepcopy(value)
+            self._deep = True
+
+    @classmethod
+    def of(cls, value: Any) -> _Snapshot | None:
+        """Snapshot `value`, or return None if it can't be copied (e.g. generators)."""
+        try:
+            return cls(value)
+        # like pickling, deep copies can fail with almost any exception
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def get(self) -> Any:
+        """Get a fresh copy of the value."""
+        if self._pickled is not None:
+            return pickle.loads(self._pickled)
+        if self._deep:
+            return deepcopy(self._value)
+        return self._value
+
+
+class TestMetadata(NamedTuple):
+    """Stores metadata about a specific test case.
+
+    This is a `NamedTuple` rather than a frozen dataclass because one is built per
+    generated test, and tuple construction is about twice as fast.
+    """
 
     max_score: float
     config: AgaTestConfig
@@ -63,6 +180,8 @@ class SubmissionMetadata:
 class AgaTestCase(TestCase):
     """A `TestCase` which runs a single test of a `Problem`."""
 
+    __slots__ = ("_test_input", "_golden", "_under_test", "_metadata")
+
     def __init__(
         self,
         test_input: "_TestInputs[Output]",
@@ -103,17 +222,17 @@ class AgaTestCase(TestCase):
 
     @property
     def name(self) -> str:
-        """Format the name of the test case."""
-        return (
-            self._test_input.aga_kwargs.name
-            or self._metadata.config.name_fmt.format(
-                args=self._test_input.param.args_repr(self._metadata.config.name_sep),
-                kwargs=self._test_input.param.kwargs_repr(
-                    self._metadata.config.name_sep
-                ),
-                sep=self._test_input.param.sep_repr(self._metadata.config.name_sep),
-            )
-        )
+        """Format the name of the test case.
+
+        This isn't cached, since override functions may rename the test while it runs;
+        the argument reprs it's built from are cached by the test input.
+        """
+        if self._test_input.aga_kwargs.name:
+            return self._test_input.aga_kwargs.name
+
+        config = self._metadata.config
+        args, kwargs, sep = self._test_input.param_reprs(config.name_sep)
+        return config.name_fmt.format(args=args, kwargs=kwargs, sep=sep)
 
     @property
     def description(self) -> str | None:
@@ -150,20 +269,94 @@ class _TestInputs(TestCase, Generic[Output]):
     # this tells unittest not to print their default assertion error messages
     longMessage = False
 
+    # These objects are never run by unittest; they subclass `TestCase` only so that
+    # they (and override functions) can use its assertion methods. `TestCase.__init__`
+    # rebuilds the same type-equality table on every instance, so we skip it and share
+    # the state it would set up at the class level instead; `addTypeEqualityFunc`
+    # copies the table before changing it. These are exactly the attributes set by
+    # `TestCase.__init__` in CPython 3.11, which is what this was checked against; if
+    # a new version adds one, it needs to be mirrored here.
+    _testMethodName = "runTest"
+    _testMethodDoc = "No test"
+    _outcome = None
+    _subtest = None
+    _type_equality_funcs = TestCase()._type_equality_funcs  # type: ignore
+
+    __slots__ = (
+        "_cleanups",
+        "_mock_input",
+        "ctx",
+        "_param",
+        "_args_immutable",
+        "_args_shallow_copyable",
+        "_pickled_args",
+        "_golden_output",
+        "_reprs",
+        "score_info",
+    )
+
+    # pylint: disable=super-init-not-called
     def __init__(
         self,
         aga_param: _TestParam,
         mock_input: bool,
         ctx: SubmissionContext | None = None,
     ) -> None:
-        super().__init__()
+        self._cleanups: list[Any] = []
         self._mock_input = mock_input
         self.ctx = ctx
         self._param: _TestParam = aga_param
-        self.score_info = ScoreInfo(
+        args, kwargs = aga_param.args, aga_param.kwargs.values()
+        self._args_immutable = all(map(_is_deeply_immutable, args)) and all(
+            map(_is_deeply_immutable, kwargs)
+        )
+        self._args_shallow_copyable = all(map(_is_shallow_copyable, args)) and all(
+            map(_is_shallow_copyable, kwargs)
+        )
+        self._pickled_args: bytes | None = None
+        self._golden_output: Tuple[
+            Callable[..., Output], bool, str | None, _Snapshot
+        ] | None = None
+        self._reprs: Dict[str, Tuple[str, str, str]] = {}
+        self.score_info = shared_score_info(
             self.aga_kwargs.weight, self.aga_kwargs.value, self.aga_kwargs.extra_credit
         )
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> _TestInputs[Output]:
+        """Deep-copy the test inputs, sharing state which can never change.
+
+        The score info is frozen, the pickled arguments are immutable bytes, and the
+        argument classification only depends on the (copied) arguments' types, so none
+        of them need to be traversed again.
+        """
+        new: _TestInputs[Output] = type(self).__new__(type(self))
+        memo[id(self)] = new
+
+        new._cleanups = []
+        new._mock_input = self._mock_input
+        new.ctx = deepcopy(self.ctx, memo)
+        new._param = deepcopy(self._param, memo)
+        new._args_immutable = self._args_immutable
+        new._args_shallow_copyable = self._args_shallow_copyable
+        new._pickled_args = self._pickled_args
+        new._golden_output = deepcopy(self._golden_output, memo)
+        new._reprs = dict(self._reprs)
+        new.score_info = self.score_info
+        new.__dict__.update(deepcopy(self.__dict__, memo))
+        return new
+
+    def addTypeEqualityFunc(  # pylint: disable=invalid-name
+        self, typeobj: type, function: Callable[..., Any] | str
+    ) -> None:
+        """Register a type-specific equality check for this test input only.
+
+        The table starts out shared between all test inputs, so it's copied onto this
+        one before the first change.
+        """
+        if self._type_equality_funcs is _TestInputs._type_equality_funcs:
+            self._type_equality_funcs = dict(self._type_equality_funcs)
+        super().addTypeEqualityFunc(typeobj, function)  # type: ignore
+
     @property
     def args(self) -> Tuple[Any, ...]:
         """Get the positional arguments for the test case."""
@@ -209,14 +402,44 @@ class _TestInputs(TestCase, Generic[Output]):
         """Set the description of the test case."""
         self.aga_kwargs.name = name
 
+    def _copy_args(self) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        """Get a copy of the arguments which is safe to pass to a function.
+
+        We copy in case the student submission mutates arguments; we don't want it to
+        mess with our copy of the arguments. Immutable arguments are shared as-is, and
+        flat containers of immutable items only need a shallow copy.
+
+        Anything else is pickled once, and each copy is unpickled from those bytes,
+        which is much faster than a deepcopy of nested containers. Arguments which
+        can't be round-tripped through pickle (lambdas, locally-defined classes, ...)
+        fall back to deepcopy.
+        """
+        if self._args_immutable:
+            return self.args, self.kwargs
+        if self._args_shallow_copyable:
+            return tuple(map(_shallow_copy, self.args)), {
+                k: _shallow_copy(v) for k, v in self.kwargs.items()
+            }
+
+        if self._pickled_args is None:
+            self._pickled_args = _try_pickle((self.args, self.kwargs))
+        if self._pickled_args is not _UNPICKLABLE:
+            return pickle.loads(self._pickled_args)  # type: ignore
+
+        return deepcopy(self.args), deepcopy(self.kwargs)
+
     def _eval_mock_input(
         self, answer: Callable[..., Output], check_output: bool = False
     ) -> Tuple[str | None, Output]:
         """Evaluate func on the arguments."""
-        # deepcopy in case the student submission mutates arguments; we don't want it to
-        # mess with our copy of the arguments
-        with CaptureOut(check_output) as stdout, patch(
-            "builtins.input", generate_custom_input(deepcopy(self.args))
+        # pylint: disable=import-outside-toplevel
+        # unittest.mock pulls in asyncio, which is a large share of aga's import time,
+        # so we only import it once a mock-input problem is actually run
+        from unittest.mock import patch
+
+        args, _ = self._copy_args()
+        with CaptureOut.maybe(check_output) as stdout, patch(
+            "builtins.input", generate_custom_input(args)
         ):
             result = answer()
 
@@ -229,9 +452,7 @@ class _TestInputs(TestCase, Generic[Output]):
         eq_fn: Callable[[_TestInputs[Output], Output, Output, TestMetadata, str], bool],
         metadata: TestMetadata,
     ) -> None:
-        golden_stdout, golden_result = self._eval_mock_input(
-            golden, metadata.check_stdout
-        )
+        golden_stdout, golden_result = self._eval_golden(golden, metadata.check_stdout)
 
         under_test_stdout, under_test_result = self._eval_mock_input(
             under_test, metadata.check_stdout
@@ -251,8 +472,9 @@ class _TestInputs(TestCase, Generic[Output]):
         self, answer: Callable[..., Output], capture_output: bool
     ) -> Tuple[str | None, Output]:
         """Evaluate func on the arguments."""
-        with CaptureOut(capture_output) as stdout:
-            result = answer(*deepcopy(self.args), **deepcopy(self.kwargs))
+        args, kwargs = self._copy_args()
+        with CaptureOut.maybe(capture_output) as stdout:
+            result = answer(*args, **kwargs)
 
         return stdout.value, result
 
@@ -263,7 +485,7 @@ class _TestInputs(TestCase, Generic[Output]):
         eq_fn: Callable[[_TestInputs[Output], Output, Output, TestMetadata, str], bool],
         metadata: TestMetadata,
     ) -> None:
-        golden_stdout, golden_result = self._eval_regular(golden, metadata.check_stdout)
+        golden_stdout, golden_result = self._eval_golden(golden, metadata.check_stdout)
         under_test_stdout, under_test_result = self._eval_regular(
             under_test, metadata.check_stdout
         )
@@ -278,6 +500,38 @@ class _TestInputs(TestCase, Generic[Output]):
 
         self._assert_output_eq(golden_stdout, under_test_stdout, metadata)
 
+    def _eval_golden(
+        self, golden: Callable[..., Output], capture_output: bool
+    ) -> Tuple[str | None, Any]:
+        """Evaluate the golden solution, reusing its earlier output if it is pure.
+
+        Every run gets its own copy of a reused output, since check functions and
+        submissions may consume or mutate it (an iterator, say). Outputs which can't be
+        copied aren't reused.
+
+        Pipelines are always re-run, since they build up state in the object under
+        test and record their steps in the test's description as they go.
+        """
+        if not self.aga_kwargs.pure or self.aga_kwargs.is_pipeline:
+            return self._pick_eval_fn()(golden, capture_output)
+
+        cached = self._golden_output
+        if (
+            cached is not None
+            and cached[0] is golden
+            and (cached[1] or not capture_output)
+        ):
+            # a cached run which captured stdout also serves callers which didn't ask
+            # for it, and they expect no stdout back
+            return (cached[2] if capture_output else None), cached[3].get()
+
+        stdout, result = self._pick_eval_fn()(golden, capture_output)
+        # snapshot the result before anything gets to consume it
+        snapshot = _Snapshot.of(result)
+        if snapshot is not None:
+            self._golden_output = (golden, capture_output, stdout, snapshot)
+        return stdout, result
+
     def _eval_pipeline(
         self, answer: Callable[..., Output], check_output: bool
     ) -> Tuple[str | None, Sequence[Any]]:
@@ -286,7 +540,7 @@ class _TestInputs(TestCase, Generic[Output]):
         if isinstance(answer, (type, FunctionType)):
             temp_name = answer.__name__
 
-        with CaptureOut(check_output) as stdout:
+        with CaptureOut.maybe(check_output) as stdout:
             results = [None]
 
             if len(self.args) > 0:
@@ -421,6 +675,20 @@ class _TestInputs(TestCase, Generic[Output]):
         msg_format: str,
     ) -> None:
         """Assert that expected equals got, formatting `msg_format` if not."""
+        # the common, passing case doesn't need unittest's comparator dispatch or the
+        # failure message; unittest's own comparators all pass when the values compare
+        # equal. we don't take the shortcut for types with a comparator registered by a
+        # check function, or whose `==` doesn't give a plain bool (e.g. arrays). past
+        # this point we render the message in the test itself, so that errors from the
+        # submission's reprs are reported as part of it
+        got_type = type(got)
+        if (
+            self._type_equality_funcs.get(got_type)
+            is _TestInputs._type_equality_funcs.get(got_type)
+            and (got == expected) is True
+        ):
+            return
+
         # we can only diff strings
         if isinstance(expected, str) and isinstance(got, str):
             diff_explanation = metadata.config.diff_explanation_msg
@@ -452,23 +720,41 @@ class _TestInputs(TestCase, Generic[Output]):
         golden: Callable[..., Output],
         under_test: Callable[..., Output],
         score: float,
-        config: AgaConfig,
+        template: TestMetadata,
     ) -> AgaTestCase:
-        """Generate a TestCase which tests `golden` against `under_test`."""
+        """Generate a TestCase which tests `golden` against `under_test`.
+
+        `template` holds the metadata shared by every test of the problem; only the
+        score and visibility are filled in per test case.
+        """
         metadata = TestMetadata(
-            hidden=self.aga_kwargs.hidden,
-            config=config.test,
             max_score=score,
-            check_stdout=config.problem.check_stdout,
-            mock_input=config.problem.mock_input,
+            config=template.config,
+            check_stdout=template.check_stdout,
+            mock_input=template.mock_input,
+            hidden=self.aga_kwargs.hidden,
         )
         return AgaTestCase(self, golden, under_test, metadata)
 
+    def param_reprs(self, sep: str) -> Tuple[str, str, str]:
+        """Get the representations of the args, the kwargs, and the separator.
+
+        These are computed once per separator, since they are needed for the name of
+        every test generated from these inputs.
+        """
+        try:
+            return self._reprs[sep]
+        except KeyError:
+            reprs = self._reprs[sep] = (
+                self._param.args_repr(sep),
+                self._param.kwargs_repr(sep),
+                self._param.sep_repr(sep),
+            )
+            return reprs
+
     def __repr__(self) -> str:
         """Get a string representation of the test case."""
-        args_repr = self._param.args_repr(",")
-        kwargs_repr = self._param.kwargs_repr(",")
-        sep = self._param.sep_repr(",")
+        args_repr, kwargs_repr, sep = self.param_reprs(",")
 
         return args_repr + sep + kwargs_repr
 
@@ -501,8 +787,7 @@ class _TestInputs(TestCase, Generic[Output]):
 
     def _default_check(self, golden: Callable[..., Output]) -> None:
         """Check that the golden solution is correct."""
-        eval_fn = self._pick_eval_fn()
-        golden_stdout, golden_output = eval_fn(golden, True)
+        golden_stdout, golden_output = self._eval_golden(golden, True)
 
         # compare output
         if self.aga_kwargs.expect is not None:
@@ -547,20 +832,47 @@ class _TestInputs(TestCase, Generic[Output]):
 class _TestInputGroup(Generic[Output]):
     """A group of test cases with shared configuration."""
 
+    __slots__ = ("_test_cases", "_prizes", "_score_infos", "score_info")
+
     def __init__(
         self, weight: int = 1, value: float = 0.0, extra_credit: float = 0.0
     ) -> None:
         self._test_cases: list[_TestInputs[Output]] = []
         self._prizes: list[Prize] = []
+        self._score_infos: list[ScoreInfo] | None = None
         self.score_info = ScoreInfo(weight, value, extra_credit)
 
     def add_test_case(self, case: _TestInputs[Output]) -> None:
         """Add a test case to the group."""
         self._test_cases.append(case)
+        self._score_infos = None
+
+    def add_test_cases(self, cases: Iterable[_TestInputs[Output]]) -> None:
+        """Add many test cases to the group."""
+        self._test_cases.extend(cases)
+        self._score_infos = None
 
     def add_prize(self, prize: Prize) -> None:
         """Add a prize to the group."""
         self._prizes.append(prize)
+        self._score_infos = None
+
+    def add_prizes(self, prizes: Iterable[Prize]) -> None:
+        """Add many prizes to the group."""
+        self._prizes.extend(prizes)
+        self._score_infos = None
+
+    def _get_score_infos(self) -> list[ScoreInfo]:
+        """Get the score infos of the test cases followed by the prizes.
+
+        These are collected once and reused for every generated suite, until another
+        test case or prize is added.
+        """
+        if self._score_infos is None:
+            self._score_infos = [case.score_info for case in self._test_cases] + [
+                prize.score_info for prize in self._prizes
+            ]
+        return self._score_infos
 
     def generate_test_suite(
         self,
@@ -572,22 +884,26 @@ class _TestInputGroup(Generic[Output]):
         """Generate a test suite from all the test cases for this group."""
         suite = AgaTestSuite(config, [])
 
-        score_infos = [case.score_info for case in self._test_cases] + [
-            prize.score_info for prize in self._prizes
-        ]
-        scores = compute_scores(score_infos, group_score)
+        scores = compute_scores(self._get_score_infos(), group_score)
 
+        template = TestMetadata(
+            max_score=0.0,
+            config=config.test,
+            check_stdout=config.problem.check_stdout,
+            mock_input=config.problem.mock_input,
+        )
         for score, case in zip(
             scores, self._test_cases
         ):  # type: float, _TestInputs[Output]
-            suite.addTest(case.generate_test_case(golden, under_test, score, config))
-
-        scored_prizes = []
-        for score, prize in zip(reversed(scores), reversed(self._prizes)):
-            # reverse scores so we get the ones that correspond to the prizes
-            scored_prizes.append(
-                ScoredPrize(prize=prize, max_score=score)  # type: ignore
-            )
+            suite.addTest(case.generate_test_case(golden, under_test, score, template))
+
+        # the prize scores are at the end, after the test case scores
+        num_cases = len(self._test_cases)
+        prize_scores = scores[num_cases:]
+        scored_prizes = [
+            ScoredPrize(prize=prize, max_score=score)
+            for prize, score in zip(self._prizes, prize_scores)
+        ]
 
         return suite, scored_prizes
 
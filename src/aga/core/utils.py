@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from contextlib import redirect_stdout
+import sys
 from io import StringIO
-from typing import Any, Dict, Sequence, Type
+from typing import Any, Dict, Sequence, TextIO, Type
 
 __all__ = (
     "CaptureOut",
@@ -25,26 +25,42 @@ def _ensure_formatting_dot(s: str) -> str:
 
 
 class CaptureOut:
-    """Context manager for capturing stdout."""
+    """Context manager for capturing stdout.
+
+    This swaps `sys.stdout` directly, like `contextlib.redirect_stdout`, but without
+    allocating a second context manager for every capture.
+    """
 
     def __init__(self, capture: bool):
         """Initialize the context manager."""
         self.capture: bool = capture
-        self.capture_device: redirect_stdout[StringIO] | None = None
         self.io_device: StringIO | None = None
+        self._old_stdout: TextIO | None = None
+
+    @classmethod
+    def maybe(cls, capture: bool) -> CaptureOut:
+        """Get a context manager which captures stdout only if `capture` is True.
+
+        A non-capturing `CaptureOut` holds no state, so one shared instance is reused
+        instead of allocating a new one for every evaluation.
+        """
+        if capture:
+            return cls(True)
+        return _NO_CAPTURE
 
     def __enter__(self) -> CaptureOut:
         """Enter the context manager."""
         if self.capture:
             self.io_device = StringIO()
-            self.capture_device = redirect_stdout(self.io_device)
-            self.capture_device.__enter__()
+            self._old_stdout = sys.stdout
+            sys.stdout = self.io_device
         return self
 
     def __exit__(self, *args: Any) -> Any:
         """Exit the context manager."""
-        if self.capture and self.capture_device:
-            return self.capture_device.__exit__(*args)
+        if self._old_stdout is not None:
+            sys.stdout = self._old_stdout
+            self._old_stdout = None
         return None
 
     @property
@@ -56,6 +72,9 @@ class CaptureOut:
             return None
 
 
+_NO_CAPTURE = CaptureOut(False)
+
+
 # pylint: disable=too-few-public-methods
 class MethodCaller:
     """Call a method on an instance."""
@@ -190,6 +190,58 @@ def load_symbol_from_path(path: str, symbol: str) -> Any:
         return _load_symbol_from_file(path, symbol)
 
 
+# stands in for a symbol the module doesn't define, since it could define it as None
+_MISSING = object()
+
+
+def _find_symbols_in_path(path: str, symbols: Iterable[str]) -> dict[str, list[Any]]:
+    """Find every definition of each of `symbols` under `path`.
+
+    Like `load_symbol_from_path`, this searches every file in a directory, but each file
+    is only loaded once for all the symbols.
+    """
+    if not isdir(path):
+        mod = _load_source_from_file(path)
+        # one attribute lookup per symbol, rather than `hasattr` and then `getattr`
+        values = ((symbol, getattr(mod, symbol, _MISSING)) for symbol in symbols)
+        return {
+            symbol: [] if value is _MISSING else [value] for symbol, value in values
+        }
+
+    found: dict[str, list[Any]] = {symbol: [] for symbol in symbols}
+    for file in os.listdir(path):
+        # ignore the pycache folder to avoid duplicated symbols
+        if file == "__pycache__":
+            continue
+
+        try:
+            file_found = _find_symbols_in_path(pathjoin(path, file), found.keys())
+        except FileNotFoundError:
+            continue
+
+        for symbol, matches in file_found.items():
+            found[symbol] += matches
+
+    return found
+
+
+def load_symbols_from_path(path: str, symbols: Iterable[str]) -> dict[str, Any]:
+    """Load several symbols from `path` at once.
+
+    This is equivalent to calling `load_symbol_from_path` for each symbol, except that
+    the submission is only loaded once.
+    """
+    loaded = {}
+    for symbol, matches in _find_symbols_in_path(path, symbols).items():
+        if len(matches) > 1:
+            raise TooManyMatchingSymbols(f"Multiple matching symbols {symbol} found.")
+        if len(matches) == 0:
+            raise NoMatchingSymbol(f"No matching symbol {symbol} found.")
+        loaded[symbol] = matches[0]
+
+    return loaded
+
+
 class _ProblemUnpickler(Unpickler):  # type: ignore
     """A custom unpickler which will always get the `Problem` class from `aga`.
 
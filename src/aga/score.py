@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
@@ -33,6 +34,19 @@ class ScoreInfo:
     extra_credit: float
 
 
+# problems only use a handful of distinct score settings, so a small bound keeps every
+# one of them shared without the cache growing for the life of the process
+@lru_cache(maxsize=128, typed=True)
+def shared_score_info(weight: int, value: float, extra_credit: float) -> ScoreInfo:
+    """Get a `ScoreInfo`, sharing one instance between callers with equal values.
+
+    Generated test cases almost all have the default score settings, so this saves
+    building an identical object for each of them. Since `ScoreInfo` is frozen, an
+    instance evicted from the cache is just rebuilt the next time.
+    """
+    return ScoreInfo(weight, value, extra_credit)
+
+
 def compute_scores(score_infos: list[ScoreInfo], total_score: float) -> list[float]:
     """Compute the scores of a list of scorable objects.
 
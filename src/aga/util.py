@@ -3,12 +3,43 @@ import difflib
 from traceback import extract_tb
 
 
+# `ndiff` looks for intraline changes by comparing every pair of lines in a replaced
+# block, which takes tens of seconds on a few hundred lines of entirely wrong output;
+# above this many pairs, we just show the replaced lines as removed and added, the way
+# `ndiff` itself does for blocks with no similar lines
+_INTRALINE_DIFF_LIMIT = 2500
+
+
 def text_diff(old: str, new: str) -> str:
-    """Generate a diff between old and new."""
+    """Generate a diff between old and new.
+
+    This is the same as `difflib.ndiff`, except that large replaced blocks are always
+    shown as plain removed and added lines (in the same order `ndiff` uses for them),
+    without pairing up similar lines or adding intraline hints.
+    """
     old_list = old.splitlines(keepends=True)
     new_list = new.splitlines(keepends=True)
 
-    return "".join(difflib.ndiff(old_list, new_list))
+    if len(old_list) * len(new_list) <= _INTRALINE_DIFF_LIMIT:
+        return "".join(difflib.ndiff(old_list, new_list))
+
+    out: list[str] = []
+    matcher = difflib.SequenceMatcher(None, old_list, new_list)
+    for tag, alo, ahi, blo, bhi in matcher.get_opcodes():
+        if tag == "equal":
+            out += ("  " + line for line in old_list[alo:ahi])
+        elif tag == "replace" and (ahi - alo) * (bhi - blo) <= _INTRALINE_DIFF_LIMIT:
+            out += difflib.ndiff(old_list[alo:ahi], new_list[blo:bhi])
+        else:
+            removed = ["- " + line for line in old_list[alo:ahi]]
+            added = ["+ " + line for line in new_list[blo:bhi]]
+            # like `ndiff`, show the shorter side of a replacement first
+            if bhi - blo < ahi - alo:
+                out += added + removed
+            else:
+                out += removed + added
+
+    return "".join(out)
 
 
 def limited_traceback(traceback) -> str:  # type: ignore
@@ -0,0 +1,24 @@
+"""Tests for the submission context."""
+from copy import deepcopy
+
+import pytest
+
+from aga.core.context import SubmissionContext
+
+
+def test_context_attribute_access() -> None:
+    """Test that context values can be read, set and deleted as attributes."""
+    ctx = SubmissionContext(["GasStation"])
+    assert ctx.GasStation is None
+
+    ctx.GasStation = 1
+    ctx.extra = 2
+    assert ctx == {"GasStation": 1, "extra": 2}
+    assert ctx.extra == 2
+    assert deepcopy(ctx).extra == 2
+
+    del ctx.extra
+    with pytest.raises(AttributeError):
+        ctx.extra  # pylint: disable=pointless-statement
+    with pytest.raises(AttributeError):
+        del ctx.extra
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from itertools import chain, combinations
-from typing import Any, Callable, Dict, Iterable
+import random
+from itertools import chain, combinations, product
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 import pytest
 
@@ -35,6 +36,18 @@ def powerset(iterable: Iterable[Any], min_length: int = 0) -> Iterable[Any]:
 class TestTestCases:
     """Test the test_cases decorator."""
 
+    def test_param_has_no_instance_dict(self) -> None:
+        """Test that params only use their slots, since one is built per test."""
+        test_param = param(3, y=4, aga_expect=7)
+
+        assert not hasattr(test_param, "__dict__")
+        assert test_param.aga_kwargs["aga_expect"] == 7
+
+    def test_invalid_aga_kwargs(self) -> None:
+        """Test that unknown aga_* keywords are rejected."""
+        with pytest.raises(ValueError, match='invalid kwargs "aga_bogus"'):
+            param(3).update_aga_kwargs(aga_bogus=1)
+
     def test_test_input_with_arguments(self) -> None:
         """Test that test_input can be used with arguments."""
         test_param = param(
@@ -205,6 +218,90 @@ class TestTestCases:
 
         _check_problem(test_problem)
 
+    def test_aga_test_cases_product_with_kwargs_order(self) -> None:
+        """Test that the product varies kwargs fastest, after all the args."""
+        params = _test_cases.parse_zip_or_product(
+            [1, 2], [3], y=[4, 5], z=[6], aga_product=True
+        )
+
+        assert [(p.args, p.kwargs) for p in params] == [
+            ((1, 3), {"y": 4, "z": 6}),
+            ((1, 3), {"y": 5, "z": 6}),
+            ((2, 3), {"y": 4, "z": 6}),
+            ((2, 3), {"y": 5, "z": 6}),
+        ]
+
+    def test_aga_test_cases_product_sample(self) -> None:
+        """Test that aga_sample draws distinct cases from the product, in order."""
+        params = _test_cases.parse_zip_or_product(
+            range(10), range(10), y=range(10), aga_product=True, aga_sample=20
+        )
+        combos = [(*p.args, p.kwargs["y"]) for p in params]
+
+        assert len(set(combos)) == 20
+        assert combos == sorted(combos)
+        assert set(combos) <= set(product(range(10), repeat=3))
+
+    def test_aga_test_cases_product_sample_seed(self) -> None:
+        """Test that aga_sample_seed fixes the sample without using global state."""
+
+        def sample(seed: int) -> List[Tuple[Any, ...]]:
+            params = _test_cases.parse_zip_or_product(
+                range(100),
+                range(100),
+                aga_product=True,
+                aga_sample=5,
+                aga_sample_seed=seed,
+            )
+            return [p.args for p in params]
+
+        state = random.getstate()
+        first = sample(0)
+        assert random.getstate() == state
+
+        random.seed(1)
+        assert sample(0) == first
+        random.seed(2)
+        assert sample(0) == first
+        assert sample(1) != first
+
+    def test_aga_test_cases_product_sample_expect(self) -> None:
+        """Test that sequence aga_ kwargs match the number of sampled cases."""
+
+        @_test_cases.product(
+            range(100), range(100), aga_sample=3, aga_expect=[None] * 3
+        )
+        @problem()
+        def test_problem(x: int, y: int) -> int:
+            return x * y
+
+        # pylint: disable=protected-access
+        assert len(test_problem._virtual_groups()[0]._test_cases) == 3
+
+    @pytest.mark.parametrize(
+        "kwargs, match",
+        [
+            ({"aga_zip": True, "aga_sample": 1}, "aga_sample requires aga_product"),
+            ({"aga_product": True, "aga_sample": 5}, "size of the product, which is 4"),
+            ({"aga_product": True, "aga_sample": -1}, "size of the product"),
+            ({"aga_product": True, "aga_sample": 1.5}, "must be an integer"),
+            ({"aga_product": True, "aga_sample": "2"}, "must be an integer"),
+            ({"aga_product": True, "aga_sample_seed": 0}, "requires aga_sample"),
+        ],
+    )
+    def test_aga_test_cases_product_sample_invalid(
+        self, kwargs: Dict[str, Any], match: str
+    ) -> None:
+        """Test that aga_sample is only allowed on products it fits in."""
+        with pytest.raises(ValueError, match=match):
+            _test_cases([1, 2], [3, 4], **kwargs)
+
+    @pytest.mark.parametrize("flag", ["aga_zip", "aga_product"])
+    def test_aga_test_cases_rejects_unknown_aga_kwargs(self, flag: str) -> None:
+        """Test that aga_* kwargs which aren't reserved keywords are still rejected."""
+        with pytest.raises(ValueError, match='aga keyword "aga_bogus"'):
+            _test_cases([1, 2], aga_bogus=[3, 4], **{flag: True})
+
     @pytest.mark.parametrize("test_fn", [_test_cases.zip, _test_cases_zip])
     def test_aga_test_cases_zip(
         self, test_fn: Callable[..., Problem[Any, Any]]
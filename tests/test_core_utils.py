@@ -1,5 +1,7 @@
 """Test the aga.core.utils module."""
 
+import sys
+
 import pytest
 
 from aga.core.utils import CaptureOut, MethodCallerFactory, PropertyGetterFactory
@@ -16,6 +18,38 @@ def test_capture_out() -> None:
     assert capture_out.value is None
 
 
+def test_capture_out_maybe() -> None:
+    """Test that `CaptureOut.maybe` shares one instance when not capturing."""
+    assert CaptureOut.maybe(False) is CaptureOut.maybe(False)
+    assert CaptureOut.maybe(True) is not CaptureOut.maybe(True)
+
+    with CaptureOut.maybe(True) as capture_out:
+        print("hello")
+    assert capture_out.value == "hello\n"
+
+    with CaptureOut.maybe(False) as capture_out:
+        print("world")
+    assert capture_out.value is None
+
+
+def test_capture_out_restores_stdout() -> None:
+    """Test that CaptureOut restores stdout, including after nesting or errors."""
+    stdout = sys.stdout
+
+    with CaptureOut(True) as outer:
+        print("a")
+        with CaptureOut(True) as inner:
+            print("b")
+        print("c")
+    assert (outer.value, inner.value) == ("a\nc\n", "b\n")
+    assert sys.stdout is stdout
+
+    with pytest.raises(ValueError):
+        with CaptureOut(True):
+            raise ValueError
+    assert sys.stdout is stdout
+
+
 class DummyClass:
     """Dummy class for testing MethodCaller and PropertyGetter."""
 
@@ -1,5 +1,6 @@
 """Tests for the `loader` module."""
 
+import os
 from io import StringIO
 from os.path import dirname
 from os.path import join as pathjoin
@@ -12,6 +13,7 @@ from dill import dump  # type: ignore
 
 from aga.core import Problem
 from aga.loader import (
+    _load_source_from_file,
     NoMatchingSymbol,
     SubmissionSyntaxError,
     TooManyMatchingSymbols,
@@ -19,6 +21,7 @@ from aga.loader import (
     load_problems_from_path,
     load_script_from_path,
     load_symbol_from_path,
+    load_symbols_from_path,
 )
 
 
@@ -85,6 +88,38 @@ def test_load_symbol_from_dir_multiple_symble_errors(source_dir: str) -> None:
         load_symbol_from_path(source_dir, "duplicate")
 
 
+def test_load_symbols_from_dir(source_dir: str) -> None:
+    """Test that load_symbols_from_path loads several symbols at once."""
+    symbols = load_symbols_from_path(source_dir, ["square", "Car"])
+    assert symbols["square"](5) == 25
+    car_tester(symbols["Car"])
+
+
+@pytest.mark.parametrize(
+    "symbols, error",
+    [
+        (["square", "foo"], NoMatchingSymbol),
+        (["square", "duplicate"], TooManyMatchingSymbols),
+    ],
+)
+def test_load_symbols_from_dir_errors(
+    source_dir: str, symbols: list[str], error: type[Exception]
+) -> None:
+    """Test that load_symbols_from_path errors like load_symbol_from_path."""
+    with pytest.raises(error):
+        load_symbols_from_path(source_dir, symbols)
+
+
+def test_load_symbols_from_dir_loads_each_file_once(source_dir: str) -> None:
+    """Test that load_symbols_from_path loads each file once for all symbols."""
+    with patch(
+        "aga.loader._load_source_from_file", wraps=_load_source_from_file
+    ) as load:
+        load_symbols_from_path(source_dir, ["square", "Car"])
+
+    assert load.call_count == len(os.listdir(source_dir))
+
+
 def test_load_problem(tmp_path: str, square: Problem[[int], int]) -> None:
     """Test that load_problem loads square correctly."""
 
@@ -4,7 +4,7 @@ from typing import Any
 
 from pytest import raises
 
-from aga import problem
+from aga import group, problem
 from aga import test_case as case
 from aga.core import Problem, test_case
 
@@ -96,3 +96,55 @@ def test_aga_expect_stdout_bad() -> None:
             print("foo")
 
         aga_expect_stdout_bad.check()
+
+
+def test_add_test_cases_preserves_order() -> None:
+    """Test that bulk-added test cases match adding them one at a time."""
+
+    @problem()
+    def square(x: int) -> int:
+        return x * x
+
+    square.add_test_cases(param.finalize() for param in (test_case(1), test_case(2)))
+    square.add_test_case(test_case(3).finalize())
+
+    grp = square._virtual_groups()[0]  # pylint: disable=protected-access
+    cases = grp._test_cases  # pylint: disable=protected-access
+    assert [c.args for c in cases] == [(1,), (2,), (3,)]
+
+
+def test_add_group_moves_pending_tests() -> None:
+    """Test that `add_group` moves all pending tests into the group, in order."""
+
+    @group()
+    @test_case(2)
+    @test_case(1)
+    @group()
+    @test_case(0)
+    @problem()
+    def square(x: int) -> int:
+        return x * x
+
+    groups = square._virtual_groups()  # pylint: disable=protected-access
+    assert [[c.args for c in grp._test_cases] for grp in groups] == [
+        [(0,)],
+        [(1,), (2,)],
+    ]
+
+
+def test_virtual_groups_cached_until_modified() -> None:
+    """Test that `_virtual_groups` is reused until a test case is added."""
+
+    @test_case(1)
+    @problem()
+    def square(x: int) -> int:
+        return x * x
+
+    # pylint: disable=protected-access
+    groups = square._virtual_groups()
+    assert square._virtual_groups() is groups
+
+    square.add_test_case(test_case(2).finalize())
+    new_groups = square._virtual_groups()
+    assert new_groups is not groups
+    assert [c.args for c in new_groups[0]._test_cases] == [(1,), (2,)]
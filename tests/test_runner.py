@@ -609,3 +609,30 @@ def test_description_pipeline_simple(
         )
         in output.tests
     )
+
+
+def test_submission_repr_error(
+    square: Problem[[int], int],
+    tmp_path: Any,
+    metadata: SubmissionMetadata,
+) -> None:
+    """Test that a failing output whose repr raises is reported as a failed test."""
+    source = tmp_path / "square.py"
+    source.write_text(
+        dedent(
+            """\
+            class Bad:
+                def __repr__(self):
+                    raise RuntimeError("no repr for you")
+
+            def square(x):
+                return Bad()
+            """
+        )
+    )
+
+    output = load_and_run(square, str(source), metadata)
+
+    assert output.score == 0
+    assert all(not t.is_correct() for t in output.tests)
+    assert all("no repr for you" in (t.error_description or "") for t in output.tests)
@@ -4,7 +4,12 @@ import pytest
 
 from aga.core import SubmissionMetadata
 from aga.runner import TcOutput
-from aga.score import ScoreInfo, compute_scores, correct_and_on_time
+from aga.score import (
+    ScoreInfo,
+    compute_scores,
+    correct_and_on_time,
+    shared_score_info,
+)
 
 
 @pytest.mark.parametrize(
@@ -33,6 +38,13 @@ def test_compute_scores(
     assert compute_scores(score_infos, total_score) == expected_out
 
 
+def test_shared_score_info() -> None:
+    """Test that equal score infos are shared, and unequal ones are not."""
+    assert shared_score_info(1, 0.0, 0.0) is shared_score_info(1, 0.0, 0.0)
+    assert shared_score_info(1, 0.0, 0.0) == ScoreInfo(1, 0.0, 0.0)
+    assert shared_score_info(2, 0.0, 0.0) != shared_score_info(1, 0.0, 0.0)
+
+
 def test_correct_and_on_time(metadata: SubmissionMetadata) -> None:
     """Test that correct_and_on_time works."""
     assert correct_and_on_time([], metadata) == (
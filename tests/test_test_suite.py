@@ -1,12 +1,14 @@
 """Tests for the `_AgaTestCase` class."""
 
-from typing import no_type_check
+from copy import deepcopy
+from typing import Any, Iterator, no_type_check
 from unittest import TestCase
 
 import pytest
 
-from aga import problem, test_case
+from aga import problem, test_case, test_cases
 from aga.core import Problem, SubmissionMetadata
+from aga.core.suite import _is_deeply_immutable, _is_shallow_copyable, _TestInputGroup
 
 
 def square_wrong(x: int) -> int:
@@ -254,3 +256,296 @@ def test_failure_description_pos_and_kwdargs(
     """
     message = diff_kwd_failure[0][0].shortDescription()
     assert message == "Test on 2,y=1."
+
+
+@pytest.mark.parametrize(
+    "value, immutable",
+    [
+        (1, True),
+        ("foo", True),
+        ((1, ("a", None)), True),
+        (frozenset({1, 2}), True),
+        ([1], False),
+        ((1, [2]), False),
+        ({"x": 1}, False),
+    ],
+)
+def test_is_deeply_immutable(value: object, immutable: bool) -> None:
+    """Test which arguments are considered safe to share between functions."""
+    assert _is_deeply_immutable(value) is immutable
+
+
+@pytest.mark.parametrize(
+    "value, shallow",
+    [
+        (1, True),
+        ([1, "a"], True),
+        ({"x": (1, 2)}, True),
+        ({1, 2}, True),
+        ([[1]], False),
+        ({"x": [1]}, False),
+        ((1, [2]), False),
+    ],
+)
+def test_is_shallow_copyable(value: object, shallow: bool) -> None:
+    """Test which arguments can be copied with a shallow copy."""
+    assert _is_shallow_copyable(value) is shallow
+
+
+def test_mutable_args_are_copied(metadata: SubmissionMetadata) -> None:
+    """Test that a submission mutating its argument doesn't affect the golden."""
+
+    @test_case([3, 1, 2])
+    @problem()
+    def sort_list(xs: list[int]) -> list[int]:
+        return sorted(xs)
+
+    def sort_in_place(xs: list[int]) -> list[int]:
+        xs.sort()
+        return xs
+
+    suite, _ = sort_list.generate_test_suite(sort_in_place, metadata)
+    result = suite.run(TestCase().defaultTestResult())
+    assert result.wasSuccessful()
+
+    grp = sort_list._virtual_groups()[0]  # pylint: disable=protected-access
+    case = grp._test_cases[0]  # pylint: disable=protected-access
+    assert case.args == ([3, 1, 2],)
+
+
+def test_nested_mutable_args_are_copied(metadata: SubmissionMetadata) -> None:
+    """Test that nested mutable args are copied, whether or not they pickle."""
+
+    class Box:  # can't be pickled, since it's defined locally
+        def __init__(self, items: list[int]) -> None:
+            self.items = items
+
+    @test_case([[1], [2]], Box([3]))
+    @problem()
+    def total(xss: list[list[int]], box: Box) -> int:
+        return sum(sum(xs) for xs in xss) + sum(box.items)
+
+    def total_destructive(xss: list[list[int]], box: Box) -> int:
+        out = sum(xss.pop()) + sum(xss.pop()) + sum(box.items)
+        box.items.clear()
+        return out
+
+    for _ in range(2):
+        suite, _ = total.generate_test_suite(total_destructive, metadata)
+        result = suite.run(TestCase().defaultTestResult())
+        assert result.wasSuccessful()
+
+
+def test_pickled_args_are_copied(metadata: SubmissionMetadata) -> None:
+    """Test that nested args copied through pickle are fresh on every run."""
+
+    @test_case([[2, 1], [3]])
+    @problem()
+    def flatten(xss: list[list[int]]) -> list[int]:
+        return [x for xs in xss for x in xs]
+
+    def flatten_destructive(xss: list[list[int]]) -> list[int]:
+        out = []
+        while xss:
+            out.extend(xss.pop(0))
+        return out
+
+    for _ in range(2):
+        suite, _ = flatten.generate_test_suite(flatten_destructive, metadata)
+        result = suite.run(TestCase().defaultTestResult())
+        assert result.wasSuccessful()
+
+
+@pytest.mark.parametrize("pure, expected_calls", [(True, 1), (False, 3)])
+def test_golden_output_reuse(
+    metadata: SubmissionMetadata, pure: bool, expected_calls: int
+) -> None:
+    """Test that a pure golden solution is only evaluated once per test case."""
+    calls = []
+
+    @test_case(2, aga_expect=4, aga_pure=pure)
+    @problem()
+    def square_counted(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    square_counted.check()
+    for _ in range(2):
+        suite, _ = square_counted.generate_test_suite(square_right, metadata)
+        assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+
+    assert len(calls) == expected_calls
+
+
+def test_deepcopy_problem(metadata: SubmissionMetadata) -> None:
+    """Test that a deep-copied problem has independent, working test inputs."""
+
+    @test_case([1, 2], aga_expect=3)
+    @problem()
+    def list_sum(xs: list[int]) -> int:
+        return sum(xs)
+
+    list_sum.check()
+    copied = deepcopy(list_sum)
+
+    # pylint: disable=protected-access
+    original_case = list_sum._virtual_groups()[0]._test_cases[0]
+    copied_case = copied._virtual_groups()[0]._test_cases[0]
+    assert copied_case is not original_case
+    assert copied_case.args == original_case.args
+    assert copied_case.args[0] is not original_case.args[0]
+    assert copied_case.score_info is original_case.score_info
+
+    copied.check()
+    suite, _ = copied.generate_test_suite(list_sum.golden, metadata)
+    assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+
+
+def test_param_reprs_cached() -> None:
+    """Test that the argument representations are computed once per separator."""
+
+    @test_case([1, 2], y="a")
+    @problem()
+    def f(xs: list[int], y: str) -> int:
+        return len(xs) + len(y)
+
+    case = f._virtual_groups()[0]._test_cases[0]  # pylint: disable=protected-access
+    assert repr(case) == "[1, 2],y='a'"
+    assert case.param_reprs(",") is case.param_reprs(",")
+    assert case.param_reprs(";") == ("[1, 2]", "y='a'", ";")
+
+
+def test_group_score_infos_cached_until_modified() -> None:
+    """Test that a group's score infos are reused until a test case is added."""
+
+    @test_cases(1, 2)
+    @problem()
+    def square(x: int) -> int:
+        return x * x
+
+    # pylint: disable=protected-access
+    grp: _TestInputGroup[int] = _TestInputGroup()
+    grp.add_test_cases(square._virtual_groups()[0]._test_cases)
+
+    score_infos = grp._get_score_infos()
+    assert grp._get_score_infos() is score_infos
+    assert len(score_infos) == 2
+
+    grp.add_test_case(grp._test_cases[0])
+    assert len(grp._get_score_infos()) == 3
+
+
+def test_golden_output_reuse_is_fresh(metadata: SubmissionMetadata) -> None:
+    """Test that every run gets its own copy of a reused golden output."""
+
+    def check_consuming(case: TestCase, golden: Any, student: Any, *_: Any) -> None:
+        case.assertEqual(list(golden), list(student))
+
+    def check_mutating(case: TestCase, golden: Any, student: Any, *_: Any) -> None:
+        case.assertEqual(golden, student)
+        golden.append(-1)
+
+    @test_case(3, aga_override_check=check_consuming)
+    @problem()
+    def count_up(n: int) -> Iterator[int]:
+        return iter(range(n))
+
+    @test_case(3, aga_override_check=check_mutating)
+    @problem()
+    def count_list(n: int) -> list[int]:
+        return list(range(n))
+
+    def count_gen(n: int) -> Iterator[int]:
+        yield from range(n)
+
+    @test_case(3, aga_override_check=check_consuming)
+    @problem()
+    def count_up_gen(n: int) -> Iterator[int]:
+        return count_gen(n)
+
+    probs: list[Problem[[int], Any]] = [count_up, count_list, count_up_gen]
+    for prob in probs:
+        for _ in range(2):
+            suite, _ = prob.generate_test_suite(prob.golden, metadata)
+            assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+
+
+def test_type_equality_funcs_are_per_test() -> None:
+    """Test that registering a type equality function only affects that test input."""
+
+    @test_cases(1, 2)
+    @problem()
+    def square(x: int) -> int:
+        return x * x
+
+    # pylint: disable=protected-access
+    first, second = square._virtual_groups()[0]._test_cases
+
+    def never_equal(*_: Any, **__: Any) -> None:  # pragma: no cover
+        raise AssertionError("never equal")
+
+    first.addTypeEqualityFunc(int, never_equal)
+
+    assert first._type_equality_funcs[int] is never_equal
+    assert int not in second._type_equality_funcs
+    assert int not in type(second)._type_equality_funcs
+
+
+def test_golden_output_reuse_without_stdout(metadata: SubmissionMetadata) -> None:
+    """Test that a cached run which captured stdout doesn't leak it to later runs."""
+
+    @test_case(3, aga_expect=9)
+    @problem()
+    def square_noisy(x: int) -> int:
+        print(f"debug: {x}")
+        return x * x
+
+    square_noisy.check()
+    suite, _ = square_noisy.generate_test_suite(square_right, metadata)
+    assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+
+
+def test_registered_type_equality_func_is_used(metadata: SubmissionMetadata) -> None:
+    """Test that a registered comparator is used for types without a bool `==`."""
+
+    class Ambiguous:
+        def __bool__(self) -> bool:
+            raise ValueError("truth value is ambiguous")
+
+    class Grid:
+        def __init__(self, cells: list[int]) -> None:
+            self.cells = cells
+
+        def __eq__(self, other: object) -> Any:
+            return Ambiguous()
+
+        __hash__ = None  # type: ignore
+
+    def grids_equal(first: Grid, second: Grid, msg: Any = None) -> None:
+        assert first.cells == second.cells, msg
+
+    @test_case(3)
+    @problem()
+    def make_grid(n: int) -> Grid:
+        return Grid(list(range(n)))
+
+    # pylint: disable=protected-access
+    make_grid._virtual_groups()[0]._test_cases[0].addTypeEqualityFunc(Grid, grids_equal)
+
+    suite, _ = make_grid.generate_test_suite(make_grid.golden, metadata)
+    assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+
+
+def test_name_read_before_rename(
+    override_description: Problem[[int], bool], metadata: SubmissionMetadata
+) -> None:
+    """Test that an override can rename a test whose name was already read."""
+    suite, _ = override_description.generate_test_suite(
+        override_description.golden, metadata
+    )
+    cases = [case for case in suite if isinstance(case, TestCase)]
+    names = [case.shortDescription() for case in cases]
+    assert "Test on 30." in names
+
+    assert suite.run(TestCase().defaultTestResult()).wasSuccessful()
+    assert "30 is a special number" in [case.shortDescription() for case in cases]
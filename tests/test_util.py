@@ -1,5 +1,7 @@
 """Tests for the util module."""
 
+from difflib import ndiff
+
 from aga.util import text_diff
 
 
@@ -9,3 +11,27 @@ def test_text_diff() -> None:
     new = "bc\nd"
     diff = text_diff(old, new)
     assert diff == "- ac\n+ bc\n  d"
+
+
+def test_text_diff_large_replacement() -> None:
+    """Test that large replaced blocks are diffed without intraline hints."""
+    old = "same\n" + "".join(f"row {i}: {i * i}\n" for i in range(100))
+    new = "same\n" + "".join(f"row {i}: {i * i + 1}\n" for i in range(100))
+    diff = text_diff(old, new).splitlines()
+
+    assert diff[0] == "  same"
+    assert diff[1:101] == [f"- row {i}: {i * i}" for i in range(100)]
+    assert diff[101:] == [f"+ row {i}: {i * i + 1}" for i in range(100)]
+
+
+def test_text_diff_large_replacement_order() -> None:
+    """Test that large replaced blocks are in ndiff's order, shorter side first."""
+    old = "".join(f"old line number {i}\n" for i in range(100))
+    new = "".join(f"{i} is new\n" for i in range(40))
+
+    # none of the lines are similar, so ndiff doesn't pair any of them up either
+    assert text_diff(old, new) == "".join(
+        ndiff(old.splitlines(keepends=True), new.splitlines(keepends=True))
+    )
+    assert text_diff(old, new).startswith("+ 0 is new")
+    assert text_diff(new, old).startswith("- 0 is new")